@@ -1,11 +1,17 @@
+import argparse
 import json
+import math
 import sys
 import os
+from itertools import chain
 from pathlib import Path
 
 import cv2
 import mediapipe as mp
 
+from swing_gate import SwingGate
+from video_io import PRESETS, READER_BACKENDS, WRITER_BACKENDS, open_reader, open_writer
+
 
 def resolve_video_path(project_name: str = "GolfAnalyzer",
                        config: str = "Release",
@@ -50,68 +56,158 @@ def resolve_video_path(project_name: str = "GolfAnalyzer",
 
 def process_video(input_path: str = "video1.avi",
                   output_path: str = "outputvideo.avi",
-                  skeleton_only: bool = False) -> None:
-    cap = cv2.VideoCapture(input_path)
-    if not cap.isOpened():
+                  skeleton_only: bool = False,
+                  reader_backend: str = "threaded",
+                  writer_backend: str = "opencv",
+                  preset: str = "balanced",
+                  segment_only: bool = False,
+                  window: tuple[float, float] | None = None) -> dict:
+    """
+    Draws the pose skeleton onto `input_path` and writes it to `output_path`.
+
+    segment_only: gate on wrist motion and keep only the first swing.
+    window: (start_s, end_s) to keep, in seconds; frames outside it skip
+            inference. Used to cut the second camera to the first one's swing.
+
+    Returns the written frame range: {"fps", "start_frame", "end_frame",
+    "triggered"} with inclusive 0-based frame indices.
+    """
+    reader = open_reader(input_path, reader_backend)
+    if not reader.is_opened():
         print(f"Failed to open input video: {input_path}")
         sys.exit(1)
 
     # Read first frame to initialize writer with proper size.
-    ok, first_frame = cap.read()
-    if not ok:
+    frames = iter(reader)
+    first_frame = next(frames, None)
+    if first_frame is None:
         print("Failed to read the first frame.")
-        cap.release()
+        reader.release()
         sys.exit(1)
 
     height, width = first_frame.shape[:2]
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    if fps is None or fps <= 1e-2:
-        fps = 30.0  # fallback if metadata missing
-
-    # Prefer XVID for .avi; fallback to MJPG if needed.
-    def create_writer(codec: str):
-        fourcc = cv2.VideoWriter_fourcc(*codec)
-        return cv2.VideoWriter(output_path, fourcc, fps, (width, height))
-
-    writer = create_writer("XVID")
-    if not writer.isOpened():
-        writer = create_writer("MJPG")
-    if not writer.isOpened():
+    fps = reader.fps
+
+    try:
+        writer = open_writer(output_path, fps, (width, height), writer_backend, preset)
+    except ValueError as e:
+        print(e)
+        reader.release()
+        sys.exit(1)
+    if not writer.is_opened():
         print(f"Failed to create video writer for: {output_path}")
-        cap.release()
+        reader.release()
+        try:
+            writer.release()
+        except Exception:
+            pass  # already reporting the failure
         sys.exit(1)
 
-    mp_pose = mp.solutions.pose
-    mp_drawing = mp.solutions.drawing_utils
-
-    with mp_pose.Pose(
-        static_image_mode=False,
-        model_complexity=1,
-        enable_segmentation=False,
-        min_detection_confidence=0.5,
-        min_tracking_confidence=0.5
-        # Note: omit refine_landmarks for compatibility with older MediaPipe versions
-    ) as pose:
-
-        # Process already-read first frame
-        frames_processed = 0
-        for frame in [first_frame]:
-            output = _process_frame(frame, pose, mp_drawing, mp_pose, skeleton_only)
-            writer.write(output)
-            frames_processed += 1
-
-        # Process remaining frames
-        while True:
-            ok, frame = cap.read()
-            if not ok:
-                break
-            output = _process_frame(frame, pose, mp_drawing, mp_pose, skeleton_only)
-            writer.write(output)
-            frames_processed += 1
-
-    cap.release()
-    writer.release()
-    print(f"Done. Frames written: {frames_processed}. Output: {Path(output_path).resolve()}")
+    frames_processed = 0
+    frames_written = 0
+    first_index = last_index = None
+    completed = False
+    gate = None
+    full_writer = None
+    if window is not None:
+        # Widen to whole frames so the window is always fully covered (end is exclusive)
+        window_start = math.floor(window[0] * fps + 1e-9)
+        window_end = math.ceil(window[1] * fps - 1e-9) - 1
+    full_path = _whole_clip_path(output_path)
+    try:
+        if segment_only:
+            gate = SwingGate(fps)
+            # Keep the whole annotated clip as well until the gate opens, so a
+            # missed swing does not need a second inference pass
+            full_writer = open_writer(full_path, fps, (width, height), writer_backend, preset)
+            if not full_writer.is_opened():
+                raise RuntimeError(f"Failed to create video writer for: {full_path}")
+
+        mp_pose = mp.solutions.pose
+        mp_drawing = mp.solutions.drawing_utils
+        wrist_ids = (int(mp_pose.PoseLandmark.LEFT_WRIST.value), int(mp_pose.PoseLandmark.RIGHT_WRIST.value))
+
+        with mp_pose.Pose(
+            static_image_mode=False,
+            model_complexity=1,
+            enable_segmentation=False,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5
+            # Note: omit refine_landmarks for compatibility with older MediaPipe versions
+        ) as pose:
+
+            # Process already-read first frame, then the remaining frames
+            for index, frame in enumerate(chain([first_frame], frames)):
+                if window is not None and index < window_start:
+                    continue
+                if window is not None and index > window_end:
+                    break
+                output, landmarks = _process_frame(frame, pose, mp_drawing, mp_pose, skeleton_only)
+                frames_processed += 1
+                first_index = index if first_index is None else first_index
+                last_index = index
+                if gate is None:
+                    to_write = [output]
+                else:
+                    if full_writer is not None:
+                        full_writer.write(output)
+                    to_write = gate.push(output, landmarks, wrist_ids)
+                    if gate.triggered and full_writer is not None:
+                        # Swing found: the whole-clip fallback is no longer needed
+                        full_writer, w = None, full_writer
+                        w.release()
+                        Path(full_path).unlink(missing_ok=True)
+                for out in to_write:
+                    writer.write(out)
+                frames_written += len(to_write)
+                if gate and gate.done:
+                    break  # rest of the clip would be dropped anyway; skip inference
+        completed = True
+    finally:
+        # Join the reader/writer threads and close the output on error paths too
+        reader.release()
+        release_error = None
+        for w in (writer, full_writer):
+            if w is None:
+                continue
+            try:
+                w.release()
+            except Exception as e:
+                release_error = release_error or e
+        if not completed or release_error is not None:
+            Path(full_path).unlink(missing_ok=True)
+        # On an error path the original exception keeps propagating
+        if completed and release_error is not None:
+            print(f"Failed to write output video: {release_error}")
+            sys.exit(1)
+
+    if gate and not gate.triggered:
+        print("No swing detected; keeping the whole clip.")
+        os.replace(full_path, output_path)
+        frames_written = frames_processed
+
+    print(f"Done. Frames processed: {frames_processed}. Frames written: {frames_written}. "
+          f"Codec: {writer.codec}. Output: {Path(output_path).resolve()}")
+
+    triggered = bool(gate and gate.triggered)
+    if triggered:
+        first_index, last_index = gate.start_index, gate.end_index
+    return {"fps": fps, "start_frame": first_index, "end_frame": last_index, "triggered": triggered}
+
+
+def _segment_entry(info: dict) -> dict:
+    entry = dict(info)
+    entry.pop("triggered")
+    if info["start_frame"] is not None:
+        entry["start_s"] = info["start_frame"] / info["fps"]
+        entry["end_s"] = (info["end_frame"] + 1) / info["fps"]
+    return entry
+
+
+def _whole_clip_path(output_path: str) -> str:
+    # e.g. outputvideo1.avi -> outputvideo1.full.avi (same container as the output)
+    p = Path(output_path)
+    return str(p.with_name(f"{p.stem}.full{p.suffix}"))
 
 
 def _process_frame(frame, pose, mp_drawing, mp_pose, skeleton_only: bool):
@@ -127,7 +223,7 @@ def _process_frame(frame, pose, mp_drawing, mp_pose, skeleton_only: bool):
         canvas = frame.copy()
 
     if not results.pose_landmarks:
-        return canvas
+        return canvas, None
 
     h, w = canvas.shape[:2]
     lm = results.pose_landmarks.landmark
@@ -198,12 +294,33 @@ def _process_frame(frame, pose, mp_drawing, mp_pose, skeleton_only: bool):
         cx, cy = int(pt.x * w), int(pt.y * h)
         cv2.circle(canvas, (cx, cy), 3, (0, 200, 255), thickness=-1, lineType=cv2.LINE_AA)
 
-    return canvas
-
-
-if __name__ == "__main__":
-    # Usage: python PoseTracking.py [skeleton_only: 0|1]
-    sk_only = bool(int(sys.argv[1])) if len(sys.argv) > 1 else False
+    return canvas, results.pose_landmarks
+
+
+def main():
+    # Usage: python PoseTracking.py [skeleton_only: 0|1] [--reader ...] [--writer ...] [--preset ...] [--segment-only]
+    ap = argparse.ArgumentParser(description="Draw pose skeletons onto the recorded swing videos.")
+    ap.add_argument("skeleton_only", nargs="?", type=int, default=0, choices=[0, 1],
+                    help="1 = draw the skeleton on a black background")
+    ap.add_argument("--reader", default="threaded", choices=READER_BACKENDS,
+                    help="Decoder backend (threaded = read-ahead on a background thread)")
+    ap.add_argument("--writer", default="opencv", choices=WRITER_BACKENDS,
+                    help="Encoder backend (ffmpeg requires ffmpeg with libx264 on PATH; auto uses ffmpeg "
+                         "when that encoder is available, otherwise the threaded OpenCV writer)")
+    ap.add_argument("--preset", default="balanced", choices=tuple(PRESETS),
+                    help="Encoder speed/quality trade-off ('fast' is only available with the ffmpeg writer)")
+    ap.add_argument("--segment-only", action="store_true",
+                    help="Write only the first swing detected in video1 (with pre/post-roll) and cut video2 to "
+                         "the same time window, instead of the whole clips; if no swing is detected the whole "
+                         "clips are written. The chosen frame ranges are written to outputsegment.json")
+    args = ap.parse_args()
+
+    io_opts = dict(
+        reader_backend=args.reader,
+        writer_backend=args.writer,
+        preset=args.preset,
+    )
+    sk_only = bool(args.skeleton_only)
 
     # Video 1
     in1_path = resolve_video_path(project_name="GolfAnalyzer", config="Release", video_filename="video1.avi")
@@ -213,6 +330,29 @@ if __name__ == "__main__":
     in2_path = resolve_video_path(project_name="GolfAnalyzer", config="Release", video_filename="video2.avi")
     out2_path = (in2_path.parent if in2_path.parent.exists() else Path.cwd()) / "outputvideo2.avi"
 
-    # Process sequentially
-    process_video(str(in1_path), str(out1_path), sk_only)
-    process_video(str(in2_path), str(out2_path), sk_only)
\ No newline at end of file
+    segment_path = out1_path.parent / "outputsegment.json"
+
+    # Process sequentially. With --segment-only, only video1 is gated; video2
+    # gets the same time window so the dashboard plays both views in sync.
+    seg1 = process_video(str(in1_path), str(out1_path), sk_only, segment_only=args.segment_only, **io_opts)
+    window = None
+    if seg1["triggered"]:
+        window = (seg1["start_frame"] / seg1["fps"], (seg1["end_frame"] + 1) / seg1["fps"])
+    seg2 = process_video(str(in2_path), str(out2_path), sk_only, window=window, **io_opts)
+
+    if not args.segment_only:
+        segment_path.unlink(missing_ok=True)  # don't leave a stale range from an earlier run
+        return
+
+    # Emit the kept frame ranges so the host can align the sensor data
+    summary = {
+        "triggered": seg1["triggered"],
+        "video1": _segment_entry(seg1),
+        "video2": _segment_entry(seg2),
+    }
+    segment_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    print("__SEGMENT__" + json.dumps(summary, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+from collections import deque
+
+
+class SwingGate:
+    """
+    Streaming gate that keeps only the first swing segment of a clip.
+
+    Wrist positions go through a 3-sample median (drops single-frame
+    landmark glitches) and then an EMA (`smoothing` is the weight of the
+    newest sample); wrists below `min_visibility` are ignored. Landmark
+    jitter on a still golfer therefore does not register as motion. The
+    segment opens once the smoothed wrist speed (normalized image units per
+    second) stays at or above `threshold` for `min_active` seconds, and
+    closes once it has stayed below for `post_roll` seconds. `pre_roll`
+    seconds before the motion started are kept so the takeaway is not cut off.
+
+    If the gate never opens nothing is written; check `triggered` afterwards.
+    Once it has opened, `start_index`/`end_index` give the first and last
+    written frame as 0-based indices into the pushed frames.
+    """
+
+    def __init__(self, fps: float, threshold: float = 0.5,
+                 pre_roll: float = 0.5, post_roll: float = 1.0, min_active: float = 0.1,
+                 smoothing: float = 0.3, min_visibility: float = 0.5):
+        self.fps = fps
+        self.threshold = threshold
+        self.smoothing = smoothing
+        self.min_visibility = min_visibility
+        self.post_roll_frames = max(1, int(round(post_roll * fps)))
+        self.min_active_frames = max(1, int(round(min_active * fps)))
+        # Pre-roll plus the frames spent confirming the trigger
+        self._pending = deque(maxlen=max(1, int(round(pre_roll * fps))) + self.min_active_frames)
+        self._raw: dict[int, deque] = {}
+        self._smoothed: dict[int, tuple[float, float]] = {}
+        self._state = "idle"  # idle -> active -> done
+        self._active = 0
+        self._quiet = 0
+        self._count = 0
+        self.start_index: int | None = None
+        self.end_index: int | None = None
+
+    @property
+    def triggered(self) -> bool:
+        return self._state != "idle"
+
+    @property
+    def done(self) -> bool:
+        return self._state == "done"
+
+    def _wrist_speed(self, landmarks, wrist_ids) -> float:
+        if landmarks is None:
+            self._raw.clear()
+            self._smoothed.clear()
+            return 0.0
+        lm = landmarks.landmark
+        a = self.smoothing
+        speed = 0.0
+        for i in wrist_ids:
+            pt = lm[i]
+            if getattr(pt, "visibility", 1.0) < self.min_visibility:
+                self._raw.pop(i, None)
+                self._smoothed.pop(i, None)
+                continue
+            raw = self._raw.setdefault(i, deque(maxlen=3))
+            raw.append((pt.x, pt.y))
+            x = sorted(p[0] for p in raw)[len(raw) // 2]
+            y = sorted(p[1] for p in raw)[len(raw) // 2]
+            prev = self._smoothed.get(i)
+            if prev is None:
+                self._smoothed[i] = (x, y)
+                continue
+            cur = (prev[0] + a * (x - prev[0]), prev[1] + a * (y - prev[1]))
+            self._smoothed[i] = cur
+            step = ((cur[0] - prev[0]) ** 2 + (cur[1] - prev[1]) ** 2) ** 0.5
+            speed = max(speed, step * self.fps)
+        return speed
+
+    def push(self, frame, landmarks, wrist_ids) -> list:
+        """Feed one processed frame; returns the frames that should be written now."""
+        if self._state == "done":
+            return []
+
+        index = self._count
+        self._count += 1
+        moving = self._wrist_speed(landmarks, wrist_ids) >= self.threshold
+
+        if self._state == "idle":
+            self._pending.append(frame)
+            self._active = self._active + 1 if moving else 0
+            if self._active < self.min_active_frames:
+                return []
+            self._state = "active"
+            out = list(self._pending)
+            self._pending.clear()
+            self.start_index = index - len(out) + 1
+            self.end_index = index
+            return out
+
+        # active
+        self.end_index = index
+        self._quiet = 0 if moving else self._quiet + 1
+        if self._quiet >= self.post_roll_frames:
+            self._state = "done"
+        return [frame]
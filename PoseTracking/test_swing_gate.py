@@ -0,0 +1,72 @@
+import random
+from types import SimpleNamespace
+
+from swing_gate import SwingGate
+
+FPS = 30.0
+WRISTS = (15, 16)
+
+
+def _landmarks(x, y, visibility=1.0):
+    pt = SimpleNamespace(x=x, y=y, visibility=visibility)
+    return SimpleNamespace(landmark={i: pt for i in WRISTS})
+
+
+def _run(gate, track):
+    """Feeds (x, y[, visibility]) samples as frames 0..N-1; returns the written frame indices."""
+    written = []
+    for i, sample in enumerate(track):
+        written += gate.push(i, None if sample is None else _landmarks(*sample), WRISTS)
+        if gate.done:
+            break
+    return written
+
+
+def test_trigger_keeps_pre_roll_and_closes_after_post_roll():
+    gate = SwingGate(FPS, pre_roll=0.5, post_roll=1.0)
+    still = [(0.5, 0.5)] * 60
+    swing = [(0.5, 0.5 + 0.05 * i) for i in range(1, 11)]  # 1.5 units/s
+    rest = [(0.5, 1.0)] * 120
+
+    written = _run(gate, still + swing + rest)
+
+    assert gate.triggered and gate.done
+    assert written == list(range(written[0], written[-1] + 1))
+    assert (gate.start_index, gate.end_index) == (written[0], written[-1])
+    # Trigger is confirmed a few frames into the swing; pre-roll reaches back before it
+    assert 60 - 15 <= written[0] < 60
+    # Closes one post-roll after the smoothed speed settles, well before the clip ends
+    assert 70 + 30 <= written[-1] < 70 + 60
+    assert gate.push(999, _landmarks(0.0, 0.0), WRISTS) == []
+
+
+def test_landmark_jitter_does_not_trigger():
+    rng = random.Random(0)
+    gate = SwingGate(FPS)
+    track = [(0.5 + rng.gauss(0, 0.01), 0.5 + rng.gauss(0, 0.01)) for _ in range(600)]
+
+    assert _run(gate, track) == []
+    assert not gate.triggered
+    assert gate.start_index is None and gate.end_index is None
+
+
+def test_single_frame_spike_does_not_trigger():
+    gate = SwingGate(FPS)
+    track = [(0.5, 0.5)] * 30 + [(0.9, 0.9)] + [(0.5, 0.5)] * 30
+
+    assert _run(gate, track) == []
+
+
+def test_low_visibility_wrists_are_ignored():
+    gate = SwingGate(FPS)
+    track = [(0.5, 0.5)] * 10 + [(0.5, 0.5 + 0.05 * i, 0.1) for i in range(1, 11)]
+
+    assert _run(gate, track) == []
+
+
+def test_missing_landmarks_reset_tracking():
+    gate = SwingGate(FPS)
+    # Golfer lost for a frame and re-detected elsewhere: not a swing
+    track = [(0.2, 0.2)] * 10 + [None] + [(0.8, 0.8)] * 10
+
+    assert _run(gate, track) == []
@@ -0,0 +1,168 @@
+import os
+import sys
+import threading
+
+import cv2
+import numpy as np
+import pytest
+
+import video_io
+from video_io import FFmpegWriter, OpenCVReader, OpenCVWriter, ThreadedReader, ThreadedWriter, open_writer
+
+SIZE = (64, 48)
+N_FRAMES = 20
+
+needs_posix_shell = pytest.mark.skipif(sys.platform == "win32", reason="fake ffmpeg is a shell script")
+
+
+@pytest.fixture
+def clip(tmp_path):
+    path = tmp_path / "clip.avi"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 30.0, SIZE)
+    assert writer.isOpened()
+    for i in range(N_FRAMES):
+        frame = np.full((SIZE[1], SIZE[0], 3), i * 10, dtype=np.uint8)
+        cv2.putText(frame, str(i), (5, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+        writer.write(frame)
+    writer.release()
+    return str(path)
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    """An `ffmpeg` on PATH that fails every invocation."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    exe = bin_dir / "ffmpeg"
+    exe.write_text("#!/bin/sh\necho 'fake ffmpeg: failing' >&2\nexit 1\n")
+    exe.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir) + os.pathsep + os.environ.get("PATH", ""))
+    video_io.ffmpeg_has_encoder.cache_clear()
+    yield exe
+    video_io.ffmpeg_has_encoder.cache_clear()
+
+
+def _release_with_timeout(obj, timeout=5.0):
+    t = threading.Thread(target=obj.release, daemon=True)
+    t.start()
+    t.join(timeout)
+    return not t.is_alive()
+
+
+def test_threaded_reader_matches_opencv_reader(clip):
+    with OpenCVReader(clip) as reader:
+        expected = list(reader)
+    with ThreadedReader(clip) as reader:
+        actual = list(reader)
+        # End-of-stream stays reported on repeated reads
+        assert reader.read() == (False, None)
+        assert reader.read() == (False, None)
+
+    assert len(actual) == len(expected) == N_FRAMES
+    for a, b in zip(actual, expected):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_threaded_reader_release_mid_stream(clip):
+    reader = ThreadedReader(clip, queue_size=2)
+    ok, _ = reader.read()
+    assert ok
+    # Decode thread is blocked on a full queue here
+    assert _release_with_timeout(reader)
+    assert reader.read() == (False, None)
+
+
+def test_threaded_reader_reraises_decode_errors(clip, monkeypatch):
+    real_capture = cv2.VideoCapture
+
+    class FailingCapture:
+        def __init__(self, path):
+            self._cap = real_capture(path)
+            self._reads = 0
+
+        def isOpened(self):
+            return self._cap.isOpened()
+
+        def get(self, prop):
+            return self._cap.get(prop)
+
+        def read(self):
+            self._reads += 1
+            if self._reads > 3:
+                raise cv2.error("corrupt stream")
+            return self._cap.read()
+
+        def release(self):
+            self._cap.release()
+
+    monkeypatch.setattr(video_io.cv2, "VideoCapture", FailingCapture)
+    reader = ThreadedReader(clip)
+    frames, errors = [], []
+
+    def consume():
+        try:
+            frames.extend(reader)
+        except cv2.error as e:
+            errors.append(e)
+
+    # Consume on a helper thread so a regression fails instead of hanging the run
+    t = threading.Thread(target=consume, daemon=True)
+    t.start()
+    t.join(5.0)
+    assert not t.is_alive(), "read() blocked after the decode thread died"
+    assert len(errors) == 1
+    assert len(frames) == 3
+    assert _release_with_timeout(reader)
+
+
+def test_threaded_writer_reraises_inner_error(tmp_path):
+    class FailingWriter:
+        path = str(tmp_path / "out.avi")
+        codec = "FAKE"
+
+        def __init__(self):
+            self.released = False
+
+        def is_opened(self):
+            return True
+
+        def write(self, frame):
+            raise OSError("disk full")
+
+        def release(self):
+            self.released = True
+
+    inner = FailingWriter()
+    writer = ThreadedWriter(inner)
+    for _ in range(5):
+        writer.write(np.zeros((SIZE[1], SIZE[0], 3), dtype=np.uint8))
+    with pytest.raises(OSError, match="disk full"):
+        writer.release()
+    assert inner.released
+
+
+@needs_posix_shell
+def test_ffmpeg_writer_raises_on_nonzero_exit(tmp_path, fake_ffmpeg):
+    writer = FFmpegWriter(str(tmp_path / "out.avi"), 30.0, SIZE)
+    frame = np.zeros((SIZE[1], SIZE[0], 3), dtype=np.uint8)
+    for _ in range(100):
+        writer.write(frame)
+    with pytest.raises(RuntimeError, match="status 1"):
+        writer.release()
+
+
+@pytest.mark.parametrize("backend", ["opencv", "threaded"])
+def test_open_writer_rejects_fast_preset_for_opencv(tmp_path, backend):
+    with pytest.raises(ValueError, match="fast"):
+        open_writer(str(tmp_path / "out.avi"), 30.0, SIZE, backend, "fast")
+
+
+@needs_posix_shell
+@pytest.mark.parametrize("backend, expected", [("ffmpeg", OpenCVWriter), ("auto", ThreadedWriter)])
+def test_open_writer_falls_back_when_encoder_probe_fails(tmp_path, fake_ffmpeg, backend, expected):
+    writer = open_writer(str(tmp_path / "out.avi"), 30.0, SIZE, backend, "balanced")
+    try:
+        assert isinstance(writer, expected)
+        assert writer.is_opened()
+    finally:
+        writer.release()
@@ -0,0 +1,353 @@
+import queue
+import shutil
+import subprocess
+import threading
+from functools import lru_cache
+from typing import Iterator
+
+import cv2
+import numpy as np
+
+
+READER_BACKENDS = ("opencv", "threaded")
+WRITER_BACKENDS = ("opencv", "threaded", "ffmpeg", "auto")
+
+# Speed/quality presets per writer backend.
+#  - opencv: FourCC codes tried in order until one opens. XVID both encodes
+#    faster and is far smaller than MJPG, so only "quality" prefers the
+#    intra-only MJPG stream. There is no "fast" entry: the MPEG-4 FourCCs
+#    (XVID/DIVX/mp4v/FMP4) all map to the same encoder and
+#    VIDEOWRITER_PROP_QUALITY is ignored, so nothing beats XVID.
+#  - ffmpeg: encoder arguments passed after "-c:v"
+PRESETS = {
+    "fast": {
+        "ffmpeg": ("libx264", "-preset", "ultrafast", "-crf", "28", "-pix_fmt", "yuv420p"),
+    },
+    "balanced": {
+        "opencv": ("XVID", "MJPG"),
+        "ffmpeg": ("libx264", "-preset", "veryfast", "-crf", "23", "-pix_fmt", "yuv420p"),
+    },
+    "quality": {
+        "opencv": ("MJPG", "XVID"),
+        "ffmpeg": ("libx264", "-preset", "medium", "-crf", "18", "-pix_fmt", "yuv420p"),
+    },
+}
+
+_SENTINEL = object()
+
+
+def ffmpeg_available() -> bool:
+    return shutil.which("ffmpeg") is not None
+
+
+@lru_cache(maxsize=None)
+def ffmpeg_has_encoder(encoder: str) -> bool:
+    # Many ffmpeg builds (notably on Windows) ship without libx264
+    exe = shutil.which("ffmpeg")
+    if exe is None:
+        return False
+    try:
+        proc = subprocess.run([exe, "-hide_banner", "-encoders"],
+                              capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return False
+    if proc.returncode != 0:
+        return False
+    return any(line.split()[1:2] == [encoder] for line in proc.stdout.splitlines())
+
+
+# ---------------------------------------------------------------------------
+# Readers
+# ---------------------------------------------------------------------------
+
+class OpenCVReader:
+    """Plain synchronous cv2.VideoCapture reader."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._cap = cv2.VideoCapture(path)
+        # Capture properties are read once here: cv2.VideoCapture is not
+        # thread-safe, and ThreadedReader starts decoding right after this.
+        self._opened = self._cap.isOpened()
+        fps = self._cap.get(cv2.CAP_PROP_FPS) if self._opened else 0.0
+        self.fps = float(fps) if fps and fps > 1e-2 else 30.0  # fallback if metadata missing
+
+    def is_opened(self) -> bool:
+        return self._opened
+
+    def read(self) -> tuple[bool, np.ndarray | None]:
+        return self._cap.read()
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        while True:
+            ok, frame = self.read()
+            if not ok:
+                return
+            yield frame
+
+    def release(self) -> None:
+        self._opened = False
+        self._cap.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class ThreadedReader(OpenCVReader):
+    """
+    Decodes frames on a background thread into a bounded queue so that
+    decoding overlaps with pose inference on the main thread. Inference is
+    much slower than decoding, so a few frames of read-ahead are enough; a
+    deep queue only costs memory (~6 MB per 1080p frame).
+    """
+
+    def __init__(self, path: str, queue_size: int = 8):
+        super().__init__(path)
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._error: BaseException | None = None
+        self._thread: threading.Thread | None = None
+        if self._opened:
+            self._thread = threading.Thread(target=self._run, name="ThreadedReader", daemon=True)
+            self._thread.start()
+
+    def _put(self, item) -> None:
+        # Block while the consumer is behind, but stay responsive to release()
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                ok, frame = self._cap.read()
+                if not ok:
+                    return
+                self._put(frame)
+        except BaseException as e:
+            # Re-raised from read() on the consumer thread
+            self._error = e
+        finally:
+            # Always end the stream so read() can never block forever
+            self._put(_SENTINEL)
+
+    def read(self) -> tuple[bool, np.ndarray | None]:
+        if self._thread is None:
+            return False, None
+        item = self._queue.get()
+        if item is _SENTINEL:
+            # Keep end-of-stream sticky for repeated reads
+            self._queue.put(_SENTINEL)
+            if self._error is not None:
+                raise self._error
+            return False, None
+        return True, item
+
+    def release(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        super().release()
+
+
+def open_reader(path: str, backend: str = "threaded"):
+    if backend == "opencv":
+        return OpenCVReader(path)
+    if backend == "threaded":
+        return ThreadedReader(path)
+    raise ValueError(f"Unknown reader backend: {backend!r} (expected one of {READER_BACKENDS})")
+
+
+# ---------------------------------------------------------------------------
+# Writers
+# ---------------------------------------------------------------------------
+
+class OpenCVWriter:
+    """cv2.VideoWriter that tries each FourCC code in order until one opens."""
+
+    def __init__(self, path: str, fps: float, size: tuple[int, int], codecs=("XVID", "MJPG")):
+        self.path = path
+        self.codec = None
+        self._writer = None
+        for codec in codecs:
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*codec), fps, size)
+            if writer.isOpened():
+                self._writer, self.codec = writer, codec
+                break
+            writer.release()
+
+    def is_opened(self) -> bool:
+        return self._writer is not None and self._writer.isOpened()
+
+    def write(self, frame: np.ndarray) -> None:
+        self._writer.write(frame)
+
+    def release(self) -> None:
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class FFmpegWriter:
+    """
+    Pipes raw BGR frames into a local ffmpeg process.
+
+    ffmpeg's own errors go to stderr; a dead pipe or a non-zero exit status
+    is reported by is_opened() and raised as RuntimeError from release().
+    B-frames are disabled for .avi outputs; other containers keep them.
+    """
+
+    def __init__(self, path: str, fps: float, size: tuple[int, int], encoder_args=PRESETS["balanced"]["ffmpeg"]):
+        self.path = path
+        self.codec = encoder_args[0]
+        self._proc: subprocess.Popen | None = None
+        self._size = size
+        self._error: BaseException | None = None
+
+        exe = shutil.which("ffmpeg")
+        if exe is None:
+            return
+
+        width, height = size
+        cmd = [
+            exe, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{width}x{height}", "-r", f"{fps:g}",
+            "-i", "-",
+            "-an",
+            # yuv420p needs even dimensions
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-c:v", *encoder_args,
+            # AVI has no presentation timestamps, so reordered (B-)frames
+            # play back unreliably (e.g. in WPF MediaElement)
+            *(("-bf", "0") if path.lower().endswith(".avi") else ()),
+            path,
+        ]
+        try:
+            self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+        except OSError as e:
+            self._proc = None
+            self._error = e
+
+    def is_opened(self) -> bool:
+        return self._error is None and self._proc is not None and self._proc.poll() is None
+
+    def write(self, frame: np.ndarray) -> None:
+        if self._proc is None or self._error is not None:
+            return
+        if frame.shape[1::-1] != self._size:
+            frame = cv2.resize(frame, self._size)
+        try:
+            self._proc.stdin.write(np.ascontiguousarray(frame, dtype=np.uint8).data)
+        except (OSError, ValueError) as e:
+            # ffmpeg exited early; reported by is_opened() and raised from release()
+            self._error = e
+
+    def release(self) -> None:
+        if self._proc is None:
+            return
+        try:
+            self._proc.stdin.close()
+        except OSError as e:
+            self._error = self._error or e
+        returncode = self._proc.wait()
+        self._proc = None
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg exited with status {returncode} while writing {self.path}")
+        if self._error is not None:
+            raise RuntimeError(f"ffmpeg pipe failed while writing {self.path}: {self._error}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class ThreadedWriter:
+    """Runs another writer's encode step on a background thread."""
+
+    def __init__(self, inner, queue_size: int = 8):
+        self.inner = inner
+        self.path = inner.path
+        self.codec = inner.codec
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, name="ThreadedWriter", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            frame = self._queue.get()
+            if frame is _SENTINEL:
+                return
+            if self._error is not None:
+                continue  # drain so the producer never blocks
+            try:
+                self.inner.write(frame)
+            except BaseException as e:
+                self._error = e
+
+    def is_opened(self) -> bool:
+        return self._error is None and self.inner.is_opened()
+
+    def write(self, frame: np.ndarray) -> None:
+        self._queue.put(frame)
+
+    def release(self) -> None:
+        if self._thread is not None:
+            self._queue.put(_SENTINEL)
+            self._thread.join()
+            self._thread = None
+        self.inner.release()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def open_writer(path: str, fps: float, size: tuple[int, int],
+                backend: str = "opencv", preset: str = "balanced"):
+    if preset not in PRESETS:
+        raise ValueError(f"Unknown preset: {preset!r} (expected one of {tuple(PRESETS)})")
+    if backend not in WRITER_BACKENDS:
+        raise ValueError(f"Unknown writer backend: {backend!r} (expected one of {WRITER_BACKENDS})")
+
+    if backend in ("ffmpeg", "auto"):
+        # Only probe when ffmpeg could be chosen; the probe spawns a subprocess
+        ffmpeg_args = PRESETS[preset]["ffmpeg"]
+        ffmpeg_ok = ffmpeg_has_encoder(ffmpeg_args[0])
+        if backend == "auto":
+            backend = "ffmpeg" if ffmpeg_ok else "threaded"
+
+    if backend == "ffmpeg":
+        if ffmpeg_ok:
+            return FFmpegWriter(path, fps, size, ffmpeg_args)
+        print(f"ffmpeg with the {ffmpeg_args[0]} encoder not found on PATH; falling back to OpenCV writer.")
+        backend = "opencv"
+
+    codecs = PRESETS[preset].get("opencv")
+    if codecs is None:
+        raise ValueError(f"Preset {preset!r} is not available for the OpenCV writer "
+                         f"(expected one of {tuple(p for p in PRESETS if 'opencv' in PRESETS[p])})")
+
+    writer = OpenCVWriter(path, fps, size, codecs)
+    if backend == "threaded" and writer.is_opened():
+        return ThreadedWriter(writer)
+    return writer